@@ -0,0 +1,102 @@
+import json
+import logging
+from functools import lru_cache
+
+import httpx
+import orjson
+import pytest
+import allure
+from filelock import FileLock
+from config import BASE_URL, LOGIN_URL
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------- 全局共享 Fixture（conftest.py 内自动被所有测试模块发现） --------------------------
+@pytest.fixture(scope="module", autouse=True)
+def module_setup_teardown():
+    """
+    模块级 Fixture（每个测试模块执行前后各1次），自动执行（autouse=True）
+    作用：初始化测试环境、清理资源
+    说明：日常无实际工作，banner走debug日志（默认静默），并行运行时不占stdout捕获锁
+    """
+    logger.debug("===== 接口测试模块开始 =====")
+    # 可扩展：比如提前启动测试服务、初始化测试数据库等
+
+    # yield 前是前置操作，后是后置操作
+    yield
+
+    logger.debug("===== 接口测试模块结束 =====")
+    # 可扩展：比如关闭测试服务、删除测试数据等
+
+
+@pytest.fixture(scope="session")
+def req_session():
+    """
+    会话级 Fixture（整个测试运行期间只创建1次）
+    作用：创建 httpx 客户端（整轮测试复用同一个TCP/TLS连接池，省去每个用例重建连接的握手开销），
+    测试结束后自动关闭客户端
+    接口与 requests.Session 基本一致：post(url=..., json=...) 返回带 .status_code/.content 的响应
+    """
+    with allure.step("【请求初始化】创建 httpx 客户端（全局复用，HTTP/2）"):
+        # HTTP/2：并发请求可在单条TLS连接上多路复用，服务端不支持时自动回落HTTP/1.1
+        # 连接数上限大于线程池/worker并发数，高并发时请求不用排队等空闲连接
+        # retries=2：建连失败（DNS/TCP瞬时抖动）自动重试；httpx无按状态码重试的内置机制
+        limits = httpx.Limits(max_connections=16, max_keepalive_connections=16)
+        transport = httpx.HTTPTransport(http2=True, limits=limits, retries=2)
+        session = httpx.Client(transport=transport, timeout=10.0)
+        yield session  # 把客户端对象传给测试用例
+
+    with allure.step("【请求清理】关闭 httpx 客户端"):
+        session.close()  # 自动关闭客户端，避免资源泄露
+
+
+def _login_for_token(session):
+    """真正执行登录请求并返回有效Token（供 get_login_token 调用）"""
+    login_payload = {
+        "phone": "13350180915",
+        "password": "123456",
+        "type": 2
+    }
+    login_url = f"{BASE_URL}{LOGIN_URL}"
+    response = session.post(url=login_url, json=login_payload)
+    login_result = orjson.loads(response.content)
+
+    # 确保Token获取成功（否则后续依赖接口会失败）
+    assert response.status_code == 200, "获取Token的登录请求失败"
+    assert login_result.get("success") is True, "获取Token的登录逻辑失败"
+    assert login_result.get("data") is not None, "登录响应中无Token"
+
+    valid_token = login_result.get("data")
+    assert valid_token, "登录返回的Token为空"  # Token为空时快速失败，避免后续用例反复重试
+    print(f"【获取到有效Token】: {valid_token[:20]}...")  # 打印前20位，避免敏感信息暴露
+    return valid_token
+
+
+@pytest.fixture(scope="session")
+def get_login_token(req_session, tmp_path_factory, worker_id):
+    """
+    会话级 Fixture：返回“按需取Token”的函数，首次调用才真正登录（惰性）
+    作用：需要登录的用例调用 get_login_token() 拿有效Token；只跑不需要Token的用例
+    （如 pytest -k send_code）时整轮运行0次登录
+    并行说明：lru_cache保证单个worker进程内最多登录1次；xdist多进程时再通过文件锁
+    保证全局只有1个worker真正登录，其余worker读缓存文件
+    """
+    @lru_cache(maxsize=1)
+    def _get():
+        with allure.step("【Token获取】通过正确账号登录，获取有效Token"):
+            if worker_id == "master":
+                # 未开启 xdist（单进程运行），直接登录即可
+                return _login_for_token(req_session)
+
+            # xdist 并行运行：各worker共用上级临时目录里的Token缓存文件，避免N个worker重复登录
+            token_file = tmp_path_factory.getbasetemp().parent / "login_token.json"
+            with FileLock(str(token_file) + ".lock"):
+                if token_file.is_file():
+                    valid_token = json.loads(token_file.read_text())["token"]
+                else:
+                    valid_token = _login_for_token(req_session)
+                    token_file.write_text(json.dumps({"token": valid_token}))
+            return valid_token
+
+    return _get
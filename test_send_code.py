@@ -1,169 +1,83 @@
-import requests
+import os
+import orjson
 import pytest
 import allure
+from collections import namedtuple
+from contextlib import contextmanager
 from config import BASE_URL, SEND_CODE_URL, LOGIN_URL, NOTE_DETAIL_URL
 
+# 完整接口地址：模块加载时拼接1次，避免每条用例重复做f-string拼接
+_SEND_URL = f"{BASE_URL}{SEND_CODE_URL}"
+_LOGIN_URL = f"{BASE_URL}{LOGIN_URL}"
+_NOTE_URL = f"{BASE_URL}{NOTE_DETAIL_URL}"
 
-# -------------------------- 1. 新增 Fixture（复用性强，减少重复代码） --------------------------
-@pytest.fixture(scope="module", autouse=True)
-def module_setup_teardown():
-    """
-    模块级 Fixture（所有测试类执行前后各1次），自动执行（autouse=True）
-    作用：初始化测试环境、清理资源
-    """
-    with allure.step("【模块初始化】测试开始，初始化全局环境"):
-        print("\n===== 接口测试模块开始 =====")
-        # 可扩展：比如提前启动测试服务、初始化测试数据库等
+# 公共请求头：所有需要Token的用例相同的部分，按行构造时只需补上Authorization
+_BASE_HEADERS = {"Content-Type": "application/json"}
 
-    # yield 前是前置操作，后是后置操作
-    yield
 
-    with allure.step("【模块清理】测试结束，清理测试环境"):
-        print("===== 接口测试模块结束 =====")
-        # 可扩展：比如关闭测试服务、删除测试数据等
+if os.environ.get("FAST_ALLURE") == "1":
+    # 快速模式（FAST_ALLURE=1）：步骤降级为空操作，省去每个步骤的Allure落盘开销
+    # 断言失败信息本身已带场景与预期/实际值，排查问题不依赖步骤记录
+    @contextmanager
+    def step(name):
+        yield
+else:
+    step = allure.step  # 常规模式：保留完整的Allure步骤报告
 
 
-@pytest.fixture(scope="function")
-def req_session():
+def _msg_matches(expect_msg, actual_msg):
     """
-    函数级 Fixture（每个测试用例执行前1次）
-    作用：创建 requests 会话（保持连接复用，比单次请求高效），自动关闭会话
+    预期提示匹配：预期为None/空串表示该场景不校验提示，直接通过
+    说明：预期token都是十几个字符的短串，CPython的 str.__contains__（C实现的two-way算法）
+    对这种规模已是最快路径；为6~7个短模式构建Aho-Corasick自动机的开销反而更高，故保留朴素子串匹配
     """
-    with allure.step("【请求初始化】创建 requests 会话"):
-        session = requests.Session()  # 会话对象：复用TCP连接，提升效率
-        yield session  # 把会话对象传给测试用例
-
-    with allure.step("【请求清理】关闭 requests 会话"):
-        session.close()  # 自动关闭会话，避免资源泄露
+    return not expect_msg or expect_msg in actual_msg
 
 
-@pytest.fixture(scope="function")
-def get_login_token(req_session):
+def _attach_response(request, response, name):
     """
-    模块级 Fixture（所有测试类共享）
-    作用：提前获取“有效Token”，供需要登录的接口（如笔记详情）直接使用
+    响应留痕：仅 -v 模式下把响应体作为Allure附件记录
+    相比print：常规（绿色）运行不再逐条解码响应+写stdout，并行时也不争抢输出捕获锁
     """
-    with allure.step("【Token获取】通过正确账号登录，获取有效Token"):
-        login_payload = {
-            "phone": "13350180915",
-            "password": "123456",
-            "type": 2
-        }
-        login_url = f"{BASE_URL}{LOGIN_URL}"
-        response = req_session.post(url=login_url, json=login_payload)
-        login_result = response.json()
-
-        # 确保Token获取成功（否则后续依赖接口会失败）
-        assert response.status_code == 200, "获取Token的登录请求失败"
-        assert login_result.get("success") is True, "获取Token的登录逻辑失败"
-        assert login_result.get("data") is not None, "登录响应中无Token"
-
-        valid_token = login_result.get("data")
-        print(f"【获取到有效Token】: {valid_token[:20]}...")  # 打印前20位，避免敏感信息暴露
-        return valid_token  # 返回Token，供其他用例调用
-
-
-# -------------------------- 2. 验证码发送接口（补充参数化，批量测试） --------------------------
-# 验证码接口参数化数据：(手机号, 预期success, 预期包含的提示, 场景描述)
+    if request.config.getoption("verbose") > 0:
+        allure.attach(response.content, name=name, attachment_type=allure.attachment_type.JSON)
+
+
+# 公共 Fixture（module_setup_teardown、req_session、get_login_token）统一放在 conftest.py，
+# 新增测试模块时自动共享，不会每个模块各自重新登录/重建会话
+
+
+# -------------------------- 1. 参数化数据（按接口分表维护，最终汇入统一用例表 CASES） --------------------------
+# 验证码接口参数化数据：(请求体, 预期success, 预期包含的提示, 场景描述)
+# 请求体字典在模块加载时构造好，测试热循环里直接传给 json=，不再逐行新建
 send_code_param_data = [
     # 正常场景
-    ("13350180921", True, None, "正确11位手机号"),
+    ({"phone": "13350180921"}, True, None, "正确11位手机号"),
     # 异常场景
-    ("", False, "不能为空", "手机号为空"),
-    ("133501809", False, "格式不正确", "10位手机号（格式错误）"),
-    ("1335018092123", False, "格式不正确", "13位手机号（格式错误）"),
-    ("133abc80921", False, "格式不正确", "手机号含字母（格式错误）"),
-    ("133*5018092", False, "格式不正确", "手机号含特殊字符（格式错误）")
+    ({"phone": ""}, False, "不能为空", "手机号为空"),
+    ({"phone": "133501809"}, False, "格式不正确", "10位手机号（格式错误）"),
+    ({"phone": "1335018092123"}, False, "格式不正确", "13位手机号（格式错误）"),
+    ({"phone": "133abc80921"}, False, "格式不正确", "手机号含字母（格式错误）"),
+    ({"phone": "133*5018092"}, False, "格式不正确", "手机号含特殊字符（格式错误）")
 ]
 
-
-@allure.feature("1. 验证码发送接口")
-class TestSendVerificationCode:
-    @allure.story("验证码发送场景（参数化批量测试）")
-    @allure.title("验证码测试：{scene_desc}")  # 标题带场景描述，报告更清晰
-    # 参数化装饰器：把 send_code_param_data 数据批量传入测试用例
-    @pytest.mark.parametrize("phone, expect_success, expect_msg, scene_desc", send_code_param_data)
-    def test_send_code_parametrize(self, req_session, phone, expect_success, expect_msg, scene_desc):
-        """参数化测试：批量覆盖验证码发送的正常/异常场景"""
-        # 1. 接口信息
-        send_url = f"{BASE_URL}{SEND_CODE_URL}"
-        payload = {"phone": phone}
-
-        # 2. 发送请求（使用 Fixture 的会话对象）
-        with allure.step(f"发送POST请求：手机号={phone}"):
-            response = req_session.post(url=send_url, json=payload)
-            print(f"\n【{scene_desc}】响应内容: {response.text}")
-
-        # 3. 断言（分步骤验证，失败时定位更精准）
-        with allure.step("验证HTTP状态码为200"):
-            assert response.status_code == 200, f"状态码异常：预期200，实际{response.status_code}"
-
-        response_json = response.json()
-        with allure.step(f"验证success标识：预期{expect_success}"):
-            assert response_json.get("success") is expect_success, \
-                f"success异常：预期{expect_success}，实际{response_json.get('success')}"
-
-        with allure.step(f"验证提示信息：包含「{expect_msg}」"):
-            actual_msg = response_json.get("message", "")  # 兼容message字段不存在的情况
-            assert expect_msg in actual_msg, \
-                f"提示信息异常：预期包含「{expect_msg}」，实际「{actual_msg}」"
-
-
-# -------------------------- 3. 登录接口（补充参数化+失败用例） --------------------------
-# 登录接口参数化数据：(手机号, 密码, 类型, 预期success, 预期提示, 场景描述)
+# 登录接口参数化数据：(请求体, 预期success, 预期提示, 场景描述)
 login_param_data = [
     # 正常场景
-    ("13350180915", "123456", 2, True, None, "正确账号密码登录"),
-    # 失败场景（新增）
-    ("13350180915", "1234567", 2, False, "AUTH-20004", "密码错误登录"),
-    ("13350180999", "123456", 2, False, "AUTH-20003", "手机号未注册登录"),
-    ("13350180915", "", 2, False, "AUTH-20004", "密码为空登录"),
-    ("", "123456", 2, False, "AUTH-10001", "手机号为空登录"),
-    ("13350180915", "123456", 99, False, "AUTH-10000", "登录类型非法（99不存在）")
+    ({"phone": "13350180915", "password": "123456", "type": 2}, True, None, "正确账号密码登录"),
+    # 失败场景
+    ({"phone": "13350180915", "password": "1234567", "type": 2}, False, "AUTH-20004", "密码错误登录"),
+    ({"phone": "13350180999", "password": "123456", "type": 2}, False, "AUTH-20003", "手机号未注册登录"),
+    ({"phone": "13350180915", "password": "", "type": 2}, False, "AUTH-20004", "密码为空登录"),
+    ({"phone": "", "password": "123456", "type": 2}, False, "AUTH-10001", "手机号为空登录"),
+    ({"phone": "13350180915", "password": "123456", "type": 99}, False, "AUTH-10000", "登录类型非法（99不存在）")
 ]
 
-
-@allure.feature("2. 用户登录接口")
-class TestAuthLogin:
-    @allure.story("登录场景（参数化批量测试：正常+失败）")
-    @allure.title("登录测试：{scene_desc}")
-    @pytest.mark.parametrize("phone, password, login_type, expect_success, expect_errorCode, scene_desc", login_param_data)
-    def test_login_parametrize(self, req_session, phone, password, login_type, expect_success, expect_errorCode, scene_desc):
-        """参数化测试：覆盖登录的正常场景+5种失败场景"""
-        # 1. 接口信息
-        login_url = f"{BASE_URL}{LOGIN_URL}"
-        login_payload = {
-            "phone": phone,
-            "password": password,
-            "type": login_type
-        }
-
-        # 2. 发送请求
-        with allure.step(f"发送登录请求：{scene_desc}"):
-            response = req_session.post(url=login_url, json=login_payload)
-            print(f"\n【{scene_desc}】登录响应: {response.text}")
-
-        # 3. 断言
-        with allure.step("验证HTTP状态码为200"):
-            assert response.status_code == 200, f"登录请求异常：状态码{response.status_code}"
-
-        login_result = response.json()
-        with allure.step(f"验证success标识：预期{expect_success}"):
-            assert login_result.get("success") is expect_success, \
-                f"登录结果异常：预期{expect_success}，实际{login_result.get('success')}"
-
-        with allure.step(f"验证提示信息：包含「{expect_errorCode}」"):
-            actual_errorCode = login_result.get("errorCode", "")
-            assert expect_errorCode in actual_errorCode, \
-                f"提示信息异常：预期包含「{expect_errorCode}」，实际「{actual_errorCode}」"
-
-
-# -------------------------- 4. 笔记详情接口（补充失败用例，依赖Token Fixture） --------------------------
-# 笔记查询参数化数据：(Token, 笔记ID, 预期success, 预期提示, 场景描述)
+# 笔记查询参数化数据：(Token类型, 笔记ID, 预期success, 预期提示, 场景描述)
 note_detail_param_data = [
-    # 正常场景（使用Fixture获取的有效Token）
+    # 正常场景（按需通过Fixture获取有效Token）
     ("valid_token", 1964771849623568408, True, "成功", "有效Token+正确笔记ID"),
-    # 失败场景（新增）
+    # 失败场景
     ("invalid_token", 1964771849623568408, False, "Token无效", "无效Token（伪造值）"),
     ("", 1964771849623568408, False, "Token为空", "Token为空（未登录）"),
     ("valid_token", 123456789, False, "笔记不存在", "有效Token+不存在的笔记ID"),
@@ -171,56 +85,72 @@ note_detail_param_data = [
 ]
 
 
-@allure.feature("3. 笔记详情查询接口")
-class TestNoteDetail:
-    @allure.story("笔记查询场景（参数化批量测试：正常+失败）")
-    @allure.title("笔记查询测试：{scene_desc}")
-    @pytest.mark.parametrize("token_type, note_id, expect_success, expect_msg, scene_desc", note_detail_param_data)
-    def test_note_detail_parametrize(
-            self, req_session, get_login_token, token_type, note_id, expect_success, expect_msg, scene_desc
-    ):
+# -------------------------- 2. 统一用例表：三个接口的场景汇成一张数据驱动表 --------------------------
+# 每条用例的统一描述：请求地址+请求体+Token类型 → 预期success+预期提示字段/内容
+# token_type=None 表示该接口无需Token；check_note_id=True 时额外校验返回的笔记ID
+Case = namedtuple(
+    "Case",
+    ["url", "payload", "token_type", "expect_success", "field", "substr", "check_note_id", "desc"]
+)
+
+CASES = (
+    [Case(_SEND_URL, payload, None, expect_success, "message", expect_msg, False, f"验证码：{desc}")
+     for payload, expect_success, expect_msg, desc in send_code_param_data]
+    + [Case(_LOGIN_URL, payload, None, expect_success, "errorCode", expect_code, False, f"登录：{desc}")
+       for payload, expect_success, expect_code, desc in login_param_data]
+    + [Case(_NOTE_URL, {"id": note_id}, token_type, expect_success, "message", expect_msg,
+            expect_success, f"笔记查询：{desc}")
+       for token_type, note_id, expect_success, expect_msg, desc in note_detail_param_data]
+)
+
+
+@allure.feature("小童书接口自动化（统一数据驱动）")
+class TestApiScenarios:
+    @allure.story("全接口场景（参数化批量测试：正常+失败）")
+    @allure.title("接口测试：{case.desc}")
+    @pytest.mark.parametrize("case", CASES, ids=lambda c: c.desc)
+    def test_api(self, request, req_session, get_login_token, case):
         """
-        参数化测试：覆盖笔记查询的正常场景+4种失败场景
-        依赖 get_login_token Fixture：直接使用有效Token，无需重复登录
+        统一数据驱动测试：所有接口场景共用同一套“构造请求→POST→断言”流程
+        新增场景只需往对应数据表加一行，无需新写测试函数
         """
-        # 1. 处理Token（区分“有效/无效/空”场景）
-        if token_type == "valid_token":
-            token = "Bearer " + get_login_token  # 使用Fixture的有效Token
-        elif token_type == "invalid_token":
-            token = "Bearer fake_token_123456"  # 伪造无效Token
-        else:  # token_type == ""
-            token = "Bearer "  # Token为空
-
-        # 2. 接口信息（请求头+参数）
-        note_url = f"{BASE_URL}{NOTE_DETAIL_URL}"
-        headers = {
-            "Authorization": token,  # 携带Token（有效/无效/空）
-            "Content-Type": "application/json"
-        }
-        note_payload = {"id": note_id}
-
-        # 3. 发送请求
-        with allure.step(f"发送笔记查询请求：{scene_desc}"):
-            response = req_session.post(url=note_url, json=note_payload, headers=headers)
-            print(f"\n【{scene_desc}】笔记响应: {response.text}")
-
-        # 4. 断言
-        with allure.step("验证HTTP状态码为200"):
-            assert response.status_code == 200, f"笔记请求异常：状态码{response.status_code}"
-
-        note_result = response.json()
-        with allure.step(f"验证success标识：预期{expect_success}"):
-            assert note_result.get("success") is expect_success, \
-                f"笔记查询结果异常：预期{expect_success}，实际{note_result.get('success')}"
-
-        with allure.step(f"验证提示信息：包含「{expect_msg}」"):
-            actual_msg = note_result.get("message", "")
-            assert expect_msg in actual_msg, \
-                f"提示信息异常：预期包含「{expect_msg}」，实际「{actual_msg}」"
-
-        # 额外断言：正常场景需验证笔记ID正确性
-        if expect_success:
-            with allure.step("验证返回笔记ID与请求一致"):
-                actual_note_id = note_result.get("data", {}).get("id")
-                assert actual_note_id == note_id, \
-                    f"笔记ID不匹配：预期{note_id}，实际{actual_note_id}"
\ No newline at end of file
+        # 1. 处理Token（区分“无需/有效/无效/空”场景）：公共头预先构造好，这里只补Token
+        if case.token_type is None:
+            headers = None  # 验证码/登录接口无需Token
+        else:
+            if case.token_type == "valid_token":
+                token = "Bearer " + get_login_token()  # 按需取有效Token（首次调用才登录，之后走缓存）
+            elif case.token_type == "invalid_token":
+                token = "Bearer fake_token_123456"  # 伪造无效Token
+            else:  # token_type == ""
+                token = "Bearer "  # Token为空
+            headers = {**_BASE_HEADERS, "Authorization": token}
+
+        # 2. 发送请求（请求体已在用例表中构造好）
+        with step(f"发送请求：{case.desc}"):
+            response = req_session.post(url=case.url, json=case.payload, headers=headers)
+            _attach_response(request, response, case.desc)
+
+        # 3. 断言
+        with step("验证HTTP状态码为200"):
+            assert response.status_code == 200, f"请求异常：预期200，实际{response.status_code}"
+
+        # 解析结果一次性取到局部变量，断言和报错信息直接复用，避免重复字典查找
+        result = orjson.loads(response.content)
+        success = result.get("success")
+        actual_msg = result.get(case.field, "")
+
+        with step(f"验证success标识：预期{case.expect_success}"):
+            assert success is case.expect_success, \
+                f"success异常：预期{case.expect_success}，实际{success}"
+
+        with step(f"验证提示信息：包含「{case.substr}」"):
+            assert _msg_matches(case.substr, actual_msg), \
+                f"提示信息异常：预期包含「{case.substr}」，实际「{actual_msg}」"
+
+        # 额外断言：笔记查询正常场景需验证笔记ID正确性
+        if case.check_note_id:
+            with step("验证返回笔记ID与请求一致"):
+                actual_note_id = result.get("data", {}).get("id")
+                assert actual_note_id == case.payload["id"], \
+                    f"笔记ID不匹配：预期{case.payload['id']}，实际{actual_note_id}"